@@ -1,47 +1,143 @@
 """
 IRR 計算相關的 API 路由
 """
-from flask import Blueprint, request, jsonify
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+import orjson
+from flask import Blueprint, Response, request
 from pydantic import ValidationError
-from models.irr_models_v2 import IRRCalculationRequest, EquipmentCostParams
+from models.irr_models_v2 import IRRCalculationRequest, IRRBatchCalculationRequest, EquipmentCostParams
 from services.irr_calculator import IRRCalculatorService
 
 # 創建藍圖
 irr_bp = Blueprint('irr', __name__, url_prefix='/api/irr')
 
 
+def _dumps(payload) -> bytes:
+    """以 orjson 序列化（支援 NumPy 數值）"""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _json_response(payload) -> Response:
+    """建立 JSON 回應"""
+    return Response(_dumps(payload), mimetype='application/json')
+
+
+# 計算結果快取（LRU）：鍵為標準化請求 JSON 的 SHA-256，值為 (是否成功, 序列化後的回應)
+_RESPONSE_CACHE_SIZE = 512
+_response_cache: "OrderedDict[bytes, Tuple[bool, bytes]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _calculate_irr_cached(irr_request: IRRCalculationRequest) -> Tuple[bool, bytes]:
+    """
+    計算已驗證的請求並快取序列化後的結果
+    相同情境重複送出時直接回傳已序列化的內容，並附上該結果的 success 旗標
+    """
+    # model_dump_json 的欄位順序固定（依模型定義），可作為標準化鍵
+    key = hashlib.sha256(irr_request.model_dump_json().encode()).digest()
+
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            _response_cache.move_to_end(key)
+            return cached
+
+    # 計算與序列化不持有鎖，避免阻塞其他請求
+    result = IRRCalculatorService.calculate_irr_full(irr_request)
+    cached = (result.success, _dumps(result.model_dump()))
+
+    with _response_cache_lock:
+        _response_cache[key] = cached
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+    return cached
+
+
 @irr_bp.route('/calculate', methods=['POST'])
 def calculate_irr():
     """
     計算 IRR 的主要 API 端點
     """
     try:
-        # 獲取請求數據
-        data = request.get_json()
+        # 獲取原始請求數據，由 Pydantic 一次完成 JSON 解析與驗證
+        raw_data = request.get_data(cache=False)
 
-        if not data:
-            return jsonify({
+        if not raw_data:
+            return _json_response({
                 'success': False,
                 'error': '請求數據為空'
             }), 400
 
         # 驗證請求數據
         try:
-            irr_request = IRRCalculationRequest(**data)
+            irr_request = IRRCalculationRequest.model_validate_json(raw_data)
+        except ValidationError as e:
+            return _json_response({
+                'success': False,
+                'error': f'數據驗證失敗: {str(e)}'
+            }), 400
+
+        # 執行 IRR 計算（相同請求直接取用快取結果）
+        _, body = _calculate_irr_cached(irr_request)
+
+        return Response(body, mimetype='application/json')
+
+    except Exception as e:
+        return _json_response({
+            'success': False,
+            'error': f'伺服器錯誤: {str(e)}'
+        }), 500
+
+
+@irr_bp.route('/calculate-batch', methods=['POST'])
+def calculate_irr_batch():
+    """
+    批次計算多個 IRR 情境的 API 端點
+    回應格式: {"success": <所有情境皆成功>, "results": [<與 /calculate 相同的結果>, ...]}
+    各情境是否成功以 results 內各自的 success 為準
+    """
+    try:
+        raw_data = request.get_data(cache=False)
+
+        if not raw_data:
+            return _json_response({
+                'success': False,
+                'error': '請求數據為空'
+            }), 400
+
+        # 驗證請求數據（任一情境無效即整批拒絕）
+        try:
+            batch_request = IRRBatchCalculationRequest.model_validate_json(raw_data)
         except ValidationError as e:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': f'數據驗證失敗: {str(e)}'
             }), 400
 
-        # 執行 IRR 計算
-        result = IRRCalculatorService.calculate_irr_full(irr_request)
+        # 各情境共用單筆計算的快取
+        results = [
+            _calculate_irr_cached(scenario)
+            for scenario in batch_request.scenarios
+        ]
+        success = b'true' if all(ok for ok, _ in results) else b'false'
+
+        # 每個元素皆為 orjson 輸出的完整 JSON 物件，以逗號串接放入陣列仍是合法 JSON，
+        # 因此可直接拼接 bytes，不必重新解析再序列化
+        body = (
+            b'{"success":' + success + b',"results":['
+            + b','.join(result for _, result in results) + b']}'
+        )
 
-        # 轉換為字典格式回傳
-        return jsonify(result.dict())
+        return Response(body, mimetype='application/json')
 
     except Exception as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': f'伺服器錯誤: {str(e)}'
         }), 500
@@ -53,19 +149,19 @@ def calculate_equipment_cost():
     單獨計算設備費用的 API 端點
     """
     try:
-        data = request.get_json()
+        raw_data = request.get_data(cache=False)
 
-        if not data:
-            return jsonify({
+        if not raw_data:
+            return _json_response({
                 'success': False,
                 'error': '請求數據為空'
             }), 400
 
         # 驗證設備參數
         try:
-            equipment_params = EquipmentCostParams(**data)
+            equipment_params = EquipmentCostParams.model_validate_json(raw_data)
         except ValidationError as e:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': f'設備參數驗證失敗: {str(e)}'
             }), 400
@@ -73,14 +169,14 @@ def calculate_equipment_cost():
         # 計算設備費用
         equipment_cost = IRRCalculatorService.calculate_equipment_cost(equipment_params)
 
-        return jsonify({
+        return _json_response({
             'success': True,
             'equipment_cost': equipment_cost,
             'formatted_cost': f"NT$ {equipment_cost:,.0f}"
         })
 
     except Exception as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': f'計算設備費用時發生錯誤: {str(e)}'
         }), 500
@@ -91,7 +187,7 @@ def health_check():
     """
     健康檢查端點
     """
-    return jsonify({
+    return _json_response({
         'status': 'healthy',
         'service': 'IRR Calculator API',
         'version': '1.0.0'
@@ -101,7 +197,7 @@ def health_check():
 # 錯誤處理器
 @irr_bp.errorhandler(404)
 def not_found(error):
-    return jsonify({
+    return _json_response({
         'success': False,
         'error': 'API 端點不存在'
     }), 404
@@ -109,7 +205,7 @@ def not_found(error):
 
 @irr_bp.errorhandler(405)
 def method_not_allowed(error):
-    return jsonify({
+    return _json_response({
         'success': False,
         'error': 'HTTP 方法不被允許'
     }), 405
\ No newline at end of file
@@ -3,16 +3,11 @@ Flask 主應用程式
 IRR 計算器後端 API 服務
 """
 import os
-import sys
 from flask import Flask, render_template, send_from_directory
+from flask_compress import Compress
 from flask_cors import CORS
 from dotenv import load_dotenv
 
-# 將當前目錄添加到 Python 路徑，以支援直接導入
-current_dir = os.path.dirname(os.path.abspath(__file__))
-if current_dir not in sys.path:
-    sys.path.insert(0, current_dir)
-
 # 載入環境變數
 load_dotenv()
 
@@ -36,10 +31,20 @@ def create_app():
     app.config['DEBUG'] = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-key-change-in-production')
 
+    # 回應壓縮（優先 brotli，其次 gzip；小於 500 bytes 不壓縮）
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_LEVEL'] = 6
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    Compress(app)
+
     # 註冊藍圖
     from api.irr_routes import irr_bp
     app.register_blueprint(irr_bp)
 
+    # 預熱數值核心，避免 worker 的第一個請求承擔編譯與載入時間
+    from services.irr_kernels import warm_up
+    warm_up()
+
     # 首頁路由 - 提供 IRR 計算器界面
     @app.route('/')
     def index():
@@ -76,6 +81,7 @@ def create_app():
             'description': 'IRR 計算器後端 API',
             'endpoints': {
                 'irr_calculation': '/api/irr/calculate',
+                'irr_batch_calculation': '/api/irr/calculate-batch',
                 'equipment_cost': '/api/irr/equipment-cost',
                 'health_check': '/api/irr/health'
             }
@@ -2,8 +2,8 @@
 IRR 計算相關的數據模型 (Pydantic v2 兼容版本)
 使用 Pydantic v2 進行數據驗證和序列化
 """
-from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator, model_validator
 
 
 class EquipmentCostParams(BaseModel):
@@ -33,30 +33,29 @@ class KWBasedData(BaseModel):
     end_year: int = Field(..., description="攤平結束年份")
 
 
-class IncomeData(BaseModel):
-    """收入數據"""
+class ModeInputData(BaseModel):
+    """依輸入模式提供對應數據的共用基底"""
     mode: str = Field(..., pattern="^(yearly|range|kw_based)$", description="輸入模式: yearly, range, kw_based")
     yearly_data: Optional[YearlyData] = None
     range_data: Optional[RangeData] = None
     kw_based_data: Optional[KWBasedData] = None
 
-    @field_validator('yearly_data', 'range_data', 'kw_based_data')
-    @classmethod
-    def validate_mode_data(cls, v, info):
-        if 'mode' not in info.data:
-            return v
-
-        mode = info.data['mode']
-        field_name = info.field_name
+    @model_validator(mode='after')
+    def validate_mode_data(self):
+        mode = self.mode
 
-        if mode == 'yearly' and field_name == 'yearly_data' and v is None:
+        if mode == 'yearly' and self.yearly_data is None:
             raise ValueError('yearly 模式下必須提供 yearly_data')
-        elif mode == 'range' and field_name == 'range_data' and v is None:
+        elif mode == 'range' and self.range_data is None:
             raise ValueError('range 模式下必須提供 range_data')
-        elif mode == 'kw_based' and field_name == 'kw_based_data' and v is None:
+        elif mode == 'kw_based' and self.kw_based_data is None:
             raise ValueError('kw_based 模式下必須提供 kw_based_data')
 
-        return v
+        return self
+
+
+class IncomeData(ModeInputData):
+    """收入數據"""
 
 
 class BankLoanData(BaseModel):
@@ -79,30 +78,8 @@ class InterestData(BaseModel):
         return v
 
 
-class ExpenseData(BaseModel):
+class ExpenseData(ModeInputData):
     """支出數據 (租金、運維、保險、回收費)"""
-    mode: str = Field(..., pattern="^(yearly|range|kw_based)$", description="輸入模式: yearly, range, kw_based")
-    yearly_data: Optional[YearlyData] = None
-    range_data: Optional[RangeData] = None
-    kw_based_data: Optional[KWBasedData] = None
-
-    @field_validator('yearly_data', 'range_data', 'kw_based_data')
-    @classmethod
-    def validate_mode_data(cls, v, info):
-        if 'mode' not in info.data:
-            return v
-
-        mode = info.data['mode']
-        field_name = info.field_name
-
-        if mode == 'yearly' and field_name == 'yearly_data' and v is None:
-            raise ValueError('yearly 模式下必須提供 yearly_data')
-        elif mode == 'range' and field_name == 'range_data' and v is None:
-            raise ValueError('range 模式下必須提供 range_data')
-        elif mode == 'kw_based' and field_name == 'kw_based_data' and v is None:
-            raise ValueError('kw_based 模式下必須提供 kw_based_data')
-
-        return v
 
 
 class CashFlowStatementParams(BaseModel):
@@ -133,8 +110,19 @@ class IRRCalculationRequest(BaseModel):
         return v
 
 
+class IRRBatchCalculationRequest(BaseModel):
+    """IRR 批次計算請求模型"""
+    scenarios: List[IRRCalculationRequest] = Field(..., min_length=1, max_length=100, description="計算情境列表")
+
+
+# 回應模型僅由服務端建立且建立後不再修改
+RESPONSE_MODEL_CONFIG = ConfigDict(validate_assignment=False, frozen=True, extra='ignore')
+
+
 class CashFlowItem(BaseModel):
     """現金流項目"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     year: int
     income: float
     equipment_depreciation: float
@@ -148,39 +136,49 @@ class CashFlowItem(BaseModel):
     after_tax_cash_flow: float
 
 
-class CashFlowStatementItem(BaseModel):
-    """現金流量表項目"""
-    year: int
+class CashFlowStatementTable(BaseModel):
+    """現金流量表（以欄位陣列儲存，每個欄位對應一個年度列表）"""
+    model_config = RESPONSE_MODEL_CONFIG
+
+    year: List[int] = []
     # 營運活動
-    aftertax_net_profit: float
-    equipment_depreciation: float
-    operating_cash_flow: float
+    aftertax_net_profit: List[float] = []
+    equipment_depreciation: List[float] = []
+    operating_cash_flow: List[float] = []
 
     # 投資活動
-    equipment_expenditure: float
+    equipment_expenditure: List[float] = []
 
     # 理財活動
-    loan_financing: float
-    loan_repayment: float
-    cash_capital_increase: float
-    cash_dividend: float
-    capital_reduction: float
+    loan_financing: List[float] = []
+    loan_repayment: List[float] = []
+    cash_capital_increase: List[float] = []
+    cash_dividend: List[float] = []
+    capital_reduction: List[float] = []
 
     # 現金流匯總
-    net_cash_inflow: float
-    opening_cash_flow: float
-    closing_cash_flow: float
+    net_cash_inflow: List[float] = []
+    opening_cash_flow: List[float] = []
+    closing_cash_flow: List[float] = []
 
     # IRR分析
-    cost_method_cash_flow: float
-    equity_method_cash_flow: float
+    cost_method_cash_flow: List[float] = []
+    equity_method_cash_flow: List[float] = []
 
     # 借款狀況
-    loan_balance: float
+    loan_balance: List[float] = []
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """轉換為逐年列格式（前端表格使用）"""
+        names = list(type(self).model_fields)
+        columns = [getattr(self, name) for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
 
 
 class IRRAnalysis(BaseModel):
     """IRR分析結果"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     cost_method_irr: Optional[float] = None
     equity_method_irr: Optional[float] = None
     cost_method_cash_flows: List[float] = []
@@ -189,11 +187,18 @@ class IRRAnalysis(BaseModel):
 
 class IRRCalculationResponse(BaseModel):
     """IRR 計算回應模型"""
+    model_config = RESPONSE_MODEL_CONFIG
+
     success: bool
     irr: Optional[float] = None
     error: Optional[str] = None
     equipment_cost: float
     cash_flows: List[CashFlowItem]
-    cash_flow_statement: List[CashFlowStatementItem]
+    cash_flow_statement: CashFlowStatementTable
     irr_analysis: IRRAnalysis
-    years: List[int]
\ No newline at end of file
+    years: List[int]
+
+    @field_serializer('cash_flow_statement')
+    def serialize_cash_flow_statement(self, table: CashFlowStatementTable) -> List[Dict[str, Any]]:
+        # 對外維持逐年列格式
+        return table.to_rows()
\ No newline at end of file
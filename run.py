@@ -3,23 +3,28 @@ Flask 應用啟動腳本
 """
 
 import os
+import subprocess
 import sys
 
-# 將當前目錄添加到 Python 路徑，以支援直接導入
-current_dir = os.path.dirname(os.path.abspath(__file__))
-if current_dir not in sys.path:
-    sys.path.insert(0, current_dir)
-
-from app import app
-
 if __name__ == '__main__':
+    port = int(os.getenv('PORT', 5000))
+    is_development = os.getenv('FLASK_ENV', 'production').lower() == 'development'
+    # gunicorn 依賴 fork 與 fcntl，Windows 無法執行
+    is_windows = os.name == 'nt'
+    use_gunicorn = not is_development and not is_windows
+
     # 檢查依賴
     try:
         import flask
+        import flask_compress
         import flask_cors
+        import numba
         import numpy_financial
+        import orjson
         import pandas
         import pydantic
+        if use_gunicorn:
+            import gunicorn
         print("✅ 所有依賴檢查通過")
     except ImportError as e:
         print(f"❌ 缺少依賴: {e}")
@@ -27,15 +32,43 @@ if __name__ == '__main__':
         sys.exit(1)
 
     print("🚀 啟動 IRR 計算器 Flask 服務...")
-    print("📍 前端界面: http://localhost:5000")
-    print("📍 API 文檔: http://localhost:5000/api")
-    print("📍 健康檢查: http://localhost:5000/api/irr/health")
-    print("⚠️  開發服務器警告可以忽略（這是正常的）")
-    print("="*50)
-
-    app.run(
-        host='0.0.0.0',
-        port=5000,
-        debug=True,
-        use_reloader=True
-    )
\ No newline at end of file
+    print(f"📍 前端界面: http://localhost:{port}")
+    print(f"📍 API 文檔: http://localhost:{port}/api")
+    print(f"📍 健康檢查: http://localhost:{port}/api/irr/health")
+
+    if not use_gunicorn:
+        # 開發模式或 Windows：使用 Flask 內建伺服器（開發模式支援自動重載）
+        from app import app
+
+        if is_development:
+            print("⚠️  開發服務器警告可以忽略（這是正常的）")
+        else:
+            print("⚠️  Windows 不支援 gunicorn，改用 Flask 內建伺服器（僅適合本機使用）")
+            print("   正式部署請使用 Linux / macOS 搭配 gunicorn")
+        print("="*50)
+
+        app.run(
+            host='0.0.0.0',
+            port=port,
+            debug=is_development,
+            use_reloader=is_development
+        )
+    else:
+        # 生產模式：使用 gunicorn 多進程 + 多執行緒
+        # --preload 讓應用（含數值核心預熱）在 fork worker 前載入一次
+        workers = os.getenv('GUNICORN_WORKERS', str(2 * (os.cpu_count() or 1) + 1))
+        threads = os.getenv('GUNICORN_THREADS', '8')
+
+        print(f"⚙️  gunicorn: {workers} workers × {threads} threads")
+        print("="*50)
+
+        sys.exit(subprocess.run([
+            sys.executable, '-m', 'gunicorn',
+            '-w', workers,
+            '-k', 'gthread',
+            '--threads', threads,
+            '-b', f'0.0.0.0:{port}',
+            '--preload',
+            '--chdir', os.path.dirname(os.path.abspath(__file__)),
+            'app:app'
+        ]).returncode)
@@ -2,17 +2,50 @@
 IRR 計算服務
 將原始 JavaScript 邏輯移植到 Python，使用 numpy-financial 優化計算
 """
+from functools import lru_cache
+
 import numpy as np
 import numpy_financial as npf
-from typing import List, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any
 from models.irr_models_v2 import (
     EquipmentCostParams, IncomeData, ExpenseData, InterestData,
     IRRCalculationRequest, IRRCalculationResponse, CashFlowItem,
     YearlyData, RangeData, KWBasedData, BankLoanData,
-    CashFlowStatementParams, CashFlowStatementItem, IRRAnalysis
+    CashFlowStatementParams, CashFlowStatementTable, IRRAnalysis
+)
+from services.irr_kernels import (
+    compute_cash_flows, irr_newton, NEWTON_GUESS, NEWTON_TOL, NEWTON_MAXITER
 )
 
 
+@lru_cache(maxsize=1024)
+def _compute_equipment_cost(capacity: float, price_per_kw: float, profit_rate: float, development_fee: float) -> float:
+    """計算設備費用總額（純數值，可快取）"""
+    # 調整後的每KW價格 = 原價格 ÷ (1 - 利潤率%)
+    adjusted_price_per_kw = price_per_kw / (1 - profit_rate / 100)
+
+    # 總費用 = (調整後每KW價格 + 開發費) × 建置容量
+    return (adjusted_price_per_kw + development_fee) * capacity
+
+
+@lru_cache(maxsize=1024)
+def _compute_interest_schedule(loan_amount: float, bank_rate: float, repayment_period: int, target_length: int) -> np.ndarray:
+    """計算每年利息（純數值，可快取；回傳唯讀陣列）"""
+    # 計算每年本金攤還
+    annual_principal = loan_amount / repayment_period
+
+    # 剩餘本金 = 貸款金額 - (已攤還年數 × 每年攤還本金)
+    paid_years = np.arange(target_length, dtype=np.float64)
+    remaining_principal = loan_amount - paid_years * annual_principal
+
+    # 年利息 = 剩餘本金 × 利率；攤還期數結束後，無利息
+    interest_values = remaining_principal * (bank_rate / 100)
+    interest_values[repayment_period:] = 0.0
+
+    interest_values.flags.writeable = False
+    return interest_values
+
+
 class IRRCalculatorService:
     """IRR 計算服務類"""
 
@@ -23,25 +56,25 @@ class IRRCalculatorService:
         公式：報價總金額 = {[每KW價格 ÷ (1 - 利潤率%)] + 開發費} × 建置容量
         """
         try:
-            # 調整後的每KW價格 = 原價格 ÷ (1 - 利潤率%)
-            adjusted_price_per_kw = params.price_per_kw / (1 - params.profit_rate / 100)
-
-            # 總費用 = (調整後每KW價格 + 開發費) × 建置容量
-            total_cost = (adjusted_price_per_kw + params.development_fee) * params.capacity
-
-            return total_cost
+            return _compute_equipment_cost(
+                params.capacity, params.price_per_kw, params.profit_rate, params.development_fee
+            )
         except Exception as e:
             raise ValueError(f"設備費用計算錯誤: {str(e)}")
 
     @staticmethod
-    def calculate_interest_values(interest_data: InterestData, equipment_cost: float, target_length: int, years: List[int]) -> List[float]:
+    def calculate_interest_values(interest_data: InterestData, equipment_cost: float, target_length: int, years: List[int], out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         計算利息費用
         支援無利息和銀行貸款兩種模式
+        提供 out 時直接寫入該陣列並回傳
         """
+        result = np.empty(target_length, dtype=np.float64) if out is None else out
+
         if interest_data.no_interest:
-            # 無利息模式，返回全零列表
-            return [0.0] * target_length
+            # 無利息模式，返回全零陣列
+            result.fill(0.0)
+            return result
 
         # 銀行貸款模式
         bank_loan = interest_data.bank_loan_data
@@ -51,25 +84,11 @@ class IRRCalculatorService:
         # 計算貸款金額
         loan_amount = equipment_cost * (bank_loan.loan_ratio / 100)
 
-        # 計算每年本金攤還
-        annual_principal = loan_amount / bank_loan.repayment_period
-
-        # 計算每年利息
-        interest_values = []
-        for i in range(target_length):
-            year_index = i + 1  # 第幾年 (1, 2, 3...)
-
-            if year_index <= bank_loan.repayment_period:
-                # 剩餘本金 = 貸款金額 - (已攤還年數 × 每年攤還本金)
-                remaining_principal = loan_amount - (year_index - 1) * annual_principal
-                # 年利息 = 剩餘本金 × 利率
-                annual_interest = remaining_principal * (bank_loan.bank_rate / 100)
-                interest_values.append(annual_interest)
-            else:
-                # 攤還期數結束後，無利息
-                interest_values.append(0.0)
-
-        return interest_values
+        # 複製快取結果，避免呼叫端修改快取內容
+        result[:] = _compute_interest_schedule(
+            loan_amount, bank_loan.bank_rate, bank_loan.repayment_period, target_length
+        )
+        return result
 
     @staticmethod
     def calculate_cash_flow_statement(
@@ -78,12 +97,11 @@ class IRRCalculatorService:
         years: List[int],
         cash_flow_params: CashFlowStatementParams,
         interest_data: InterestData
-    ) -> Tuple[List[CashFlowStatementItem], IRRAnalysis]:
+    ) -> Tuple[CashFlowStatementTable, IRRAnalysis]:
         """
         計算現金流量表
         """
         year_count = len(years)
-        cash_flow_statement = []
 
         # 計算基本參數
         if interest_data.no_interest:
@@ -98,107 +116,82 @@ class IRRCalculatorService:
         cash_capital_increase = equipment_cost - loan_amount
         annual_capital_reduction = cash_capital_increase / cash_flow_params.capital_reduction_period
 
-        # IRR現金流收集
-        cost_method_cash_flows = []
-        equity_method_cash_flows = []
-
-        # 期初現金流
-        opening_cash_flow = 0.0
-
-        for i in range(year_count):
-            cf = cash_flow_items[i]
-            year = years[i]
-
-            # === 營運活動 ===
-            aftertax_net_profit = cf.after_tax_cash_flow
-            equipment_depreciation = cf.equipment_depreciation
-            operating_cash_flow = aftertax_net_profit + equipment_depreciation
-
-            # === 投資活動 ===
-            equipment_expenditure = -equipment_cost if i == 0 else 0.0
-
-            # === 理財活動 ===
-            loan_financing = loan_amount if i == 0 else 0.0
-            # 還款從第二年開始
-            loan_repayment = -annual_repayment if i > 0 and i <= repayment_period else 0.0
-            cash_capital_increase_flow = cash_capital_increase if i == 0 else 0.0
-
-            # 現金股利 = 前一年稅後淨利 × 股利比率（第一年不支出）
-            if i > 0:
-                prev_aftertax_profit = cash_flow_items[i-1].after_tax_cash_flow
-                cash_dividend = -(prev_aftertax_profit * cash_flow_params.dividend_ratio / 100)
-            else:
-                cash_dividend = 0.0
-
-            # 年底減資：在最後N年分攤
-            capital_reduction_start = year_count - cash_flow_params.capital_reduction_period
-            if i >= capital_reduction_start:
-                capital_reduction = -annual_capital_reduction
-            else:
-                capital_reduction = 0.0
-
-            # === 現金流匯總 ===
-            net_cash_inflow = (operating_cash_flow + equipment_expenditure + loan_financing +
-                             loan_repayment + cash_capital_increase_flow + cash_dividend + capital_reduction)
-
-            closing_cash_flow = opening_cash_flow + net_cash_inflow
-
-            # === IRR分析 ===
-            # 成本法現金流
-            if i == 0:
-                cost_method_cash_flow = -cash_capital_increase  # 初始投資
-            else:
-                cost_method_cash_flow = -cash_dividend - capital_reduction  # 轉為正數
-
-            # 權益法現金流
-            if i == 0:
-                equity_method_cash_flow = aftertax_net_profit - cash_capital_increase  # 初始投資
-            else:
-                equity_method_cash_flow = aftertax_net_profit + abs(capital_reduction)  # 稅後淨利 + 年底減資的絕對值
-
-            # === 借款餘額 ===
-            if i == 0:
-                loan_balance = loan_amount
-            else:
-                prev_balance = cash_flow_statement[i-1].loan_balance if i > 0 else loan_amount
-                loan_balance = prev_balance + loan_repayment  # loan_repayment已是負數
-
-            # 收集IRR現金流
-            cost_method_cash_flows.append(cost_method_cash_flow)
-            equity_method_cash_flows.append(equity_method_cash_flow)
-
-            # 創建現金流量表項目
-            stmt_item = CashFlowStatementItem(
-                year=year,
-                aftertax_net_profit=aftertax_net_profit,
-                equipment_depreciation=equipment_depreciation,
-                operating_cash_flow=operating_cash_flow,
-                equipment_expenditure=equipment_expenditure,
-                loan_financing=loan_financing,
-                loan_repayment=loan_repayment,
-                cash_capital_increase=cash_capital_increase_flow,
-                cash_dividend=cash_dividend,
-                capital_reduction=capital_reduction,
-                net_cash_inflow=net_cash_inflow,
-                opening_cash_flow=opening_cash_flow,
-                closing_cash_flow=closing_cash_flow,
-                cost_method_cash_flow=cost_method_cash_flow,
-                equity_method_cash_flow=equity_method_cash_flow,
-                loan_balance=loan_balance
-            )
-
-            cash_flow_statement.append(stmt_item)
-            opening_cash_flow = closing_cash_flow
+        # === 營運活動 ===
+        aftertax_net_profit = np.array([cf.after_tax_cash_flow for cf in cash_flow_items], dtype=np.float64)
+        equipment_depreciation = np.array([cf.equipment_depreciation for cf in cash_flow_items], dtype=np.float64)
+        operating_cash_flow = aftertax_net_profit + equipment_depreciation
+
+        # === 投資活動 ===
+        equipment_expenditure = np.zeros(year_count, dtype=np.float64)
+        equipment_expenditure[0] = -equipment_cost
+
+        # === 理財活動 ===
+        loan_financing = np.zeros(year_count, dtype=np.float64)
+        loan_financing[0] = loan_amount
+
+        # 還款從第二年開始，至攤還期數結束
+        loan_repayment = np.zeros(year_count, dtype=np.float64)
+        loan_repayment[1:min(repayment_period + 1, year_count)] = -annual_repayment
+
+        cash_capital_increase_flow = np.zeros(year_count, dtype=np.float64)
+        cash_capital_increase_flow[0] = cash_capital_increase
+
+        # 現金股利 = 前一年稅後淨利 × 股利比率（第一年不支出）
+        cash_dividend = np.zeros(year_count, dtype=np.float64)
+        cash_dividend[1:] = -(aftertax_net_profit[:-1] * cash_flow_params.dividend_ratio / 100)
+
+        # 年底減資：在最後N年分攤
+        capital_reduction_start = max(year_count - cash_flow_params.capital_reduction_period, 0)
+        capital_reduction = np.zeros(year_count, dtype=np.float64)
+        capital_reduction[capital_reduction_start:] = -annual_capital_reduction
+
+        # === 現金流匯總 ===
+        net_cash_inflow = (operating_cash_flow + equipment_expenditure + loan_financing +
+                           loan_repayment + cash_capital_increase_flow + cash_dividend + capital_reduction)
+
+        # 期末現金流為淨現金流入的累計；期初現金流為前一年期末
+        closing_cash_flow = np.cumsum(net_cash_inflow)
+        opening_cash_flow = np.concatenate(([0.0], closing_cash_flow[:-1]))
+
+        # === IRR分析 ===
+        # 成本法現金流：首年為初始投資，其後為股利與減資（轉為正數）
+        cost_method_cash_flow = -cash_dividend - capital_reduction
+        cost_method_cash_flow[0] = -cash_capital_increase
+
+        # 權益法現金流：首年為稅後淨利扣除初始投資，其後為稅後淨利 + 年底減資的絕對值
+        equity_method_cash_flow = aftertax_net_profit + np.abs(capital_reduction)
+        equity_method_cash_flow[0] = aftertax_net_profit[0] - cash_capital_increase
+
+        # === 借款餘額 ===
+        loan_balance = loan_amount + np.cumsum(loan_repayment)
+
+        # 創建現金流量表（欄位格式）
+        cash_flow_statement = CashFlowStatementTable.model_construct(
+            year=list(years),
+            aftertax_net_profit=aftertax_net_profit.tolist(),
+            equipment_depreciation=equipment_depreciation.tolist(),
+            operating_cash_flow=operating_cash_flow.tolist(),
+            equipment_expenditure=equipment_expenditure.tolist(),
+            loan_financing=loan_financing.tolist(),
+            loan_repayment=loan_repayment.tolist(),
+            cash_capital_increase=cash_capital_increase_flow.tolist(),
+            cash_dividend=cash_dividend.tolist(),
+            capital_reduction=capital_reduction.tolist(),
+            net_cash_inflow=net_cash_inflow.tolist(),
+            opening_cash_flow=opening_cash_flow.tolist(),
+            closing_cash_flow=closing_cash_flow.tolist(),
+            cost_method_cash_flow=cost_method_cash_flow.tolist(),
+            equity_method_cash_flow=equity_method_cash_flow.tolist(),
+            loan_balance=loan_balance.tolist()
+        )
 
-        # 計算額外一年的成本法現金流
-        if year_count > 0:
-            # 成本法最後一年現金流 = 前一年的期末淨現金流
-            last_closing_cash_flow = cash_flow_statement[-1].closing_cash_flow
-            additional_cost_method_flow = last_closing_cash_flow
+        # IRR現金流收集
+        cost_method_cash_flows = cost_method_cash_flow.tolist()
+        equity_method_cash_flows = equity_method_cash_flow.tolist()
 
-            # 添加到IRR現金流
-            cost_method_cash_flows.append(additional_cost_method_flow)
-            # 權益法不需要額外一年，所以不添加
+        # 計算額外一年的成本法現金流：成本法最後一年現金流 = 前一年的期末淨現金流
+        # 權益法不需要額外一年，所以不添加
+        cost_method_cash_flows.append(float(closing_cash_flow[-1]))
 
         # 計算IRR
         cost_method_success, cost_method_irr, _ = IRRCalculatorService.calculate_irr_numpy(cost_method_cash_flows)
@@ -214,15 +207,16 @@ class IRRCalculatorService:
         return cash_flow_statement, irr_analysis
 
     @staticmethod
-    def process_data_input(data: IncomeData | ExpenseData, target_length: int, years: List[int], equipment_capacity: float = 0) -> List[float]:
+    def process_data_input(data: IncomeData | ExpenseData, target_length: int, years: np.ndarray, equipment_capacity: float = 0, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
-        處理輸入數據，統一轉換為指定長度的數值列表
+        處理輸入數據，統一轉換為指定長度的數值陣列
         支援三種模式：yearly, range, kw_based
+        提供 out 時直接寫入該陣列並回傳
         """
         if data.mode == "yearly":
             values = data.yearly_data.yearly_values
             # 補齊長度，用最後一個值填充
-            return IRRCalculatorService._pad_array(values, target_length)
+            return IRRCalculatorService._pad_array(values, target_length, out)
 
         elif data.mode == "range":
             # 年份範圍攤平模式
@@ -230,78 +224,66 @@ class IRRCalculatorService:
             start_year = data.range_data.start_year
             end_year = data.range_data.end_year
 
-            # 創建全零數組
-            result = [0.0] * target_length
-
-            # 計算攤平年數和每年金額
-            range_years = end_year - start_year + 1
-            amount_per_year = total_amount / range_years
-
-            # 在指定年份範圍內填入攤平金額
-            for i, year in enumerate(years):
-                if start_year <= year <= end_year:
-                    result[i] = amount_per_year
-
-            return result
-
         elif data.mode == "kw_based":
             # 基於KW計算模式
-            price_per_kw = data.kw_based_data.price_per_kw
             start_year = data.kw_based_data.start_year
             end_year = data.kw_based_data.end_year
 
             # 計算總金額 = 每KW價格 × 建置容量
-            total_amount = price_per_kw * equipment_capacity
-
-            # 創建全零數組
-            result = [0.0] * target_length
-
-            # 計算攤平年數和每年金額
-            range_years = end_year - start_year + 1
-            amount_per_year = total_amount / range_years
-
-            # 在指定年份範圍內填入攤平金額
-            for i, year in enumerate(years):
-                if start_year <= year <= end_year:
-                    result[i] = amount_per_year
-
-            return result
+            total_amount = data.kw_based_data.price_per_kw * equipment_capacity
 
         else:
             raise ValueError(f"不支援的模式: {data.mode}")
 
+        # 計算攤平年數和每年金額
+        range_years = end_year - start_year + 1
+        amount_per_year = total_amount / range_years
+
+        # 在指定年份範圍內填入攤平金額，其餘為零
+        result = np.empty(target_length, dtype=np.float64) if out is None else out
+        result.fill(0.0)
+        result[(years >= start_year) & (years <= end_year)] = amount_per_year
+        return result
+
     @staticmethod
-    def _pad_array(arr: List[float], target_length: int) -> List[float]:
+    def _pad_array(arr: List[float], target_length: int, out: Optional[np.ndarray] = None) -> np.ndarray:
         """補齊數組長度，用最後一個值填充"""
-        if len(arr) >= target_length:
-            return arr[:target_length]
-
-        result = arr.copy()
-        last_value = arr[-1] if arr else 0
-        while len(result) < target_length:
-            result.append(last_value)
+        n = min(len(arr), target_length)
+        last_value = arr[n - 1] if n else 0.0
 
+        # 一次配置完整長度（或沿用 out），再以切片寫入原始數值
+        result = np.empty(target_length, dtype=np.float64) if out is None else out
+        result[:n] = arr[:n]
+        result[n:] = last_value
         return result
 
     @staticmethod
     def calculate_irr_numpy(cash_flows: List[float]) -> Tuple[bool, float, str]:
         """
-        使用 numpy-financial 計算 IRR
+        計算 IRR（Numba Newton 法，必要時以 numpy-financial 備援）
         """
         try:
+            cash_flows_array = np.asarray(cash_flows, dtype=np.float64)
+
             # 數據驗證
-            if len(cash_flows) < 2:
+            if cash_flows_array.size < 2:
                 return False, 0, "現金流數據不足，至少需要2個數據點"
 
-            has_positive = any(cf > 0 for cf in cash_flows)
-            has_negative = any(cf < 0 for cf in cash_flows)
+            min_cash_flow = float(cash_flows_array.min())
+            max_cash_flow = float(cash_flows_array.max())
 
-            if not has_positive or not has_negative:
+            if min_cash_flow >= 0 or max_cash_flow <= 0:
                 return False, 0, "現金流必須包含正值和負值"
 
-            # 使用 numpy-financial 計算 IRR
-            cash_flows_array = np.array(cash_flows)
-            irr_result = npf.irr(cash_flows_array)
+            # 現金流僅變號一次時 IRR 唯一，使用 Newton 法計算
+            # 多次變號（多重解）或未收斂時退回 numpy-financial
+            nonzero = cash_flows_array[cash_flows_array != 0]
+            sign_changes = np.count_nonzero(np.signbit(nonzero[1:]) != np.signbit(nonzero[:-1]))
+            converged = False
+            if sign_changes == 1:
+                converged, irr_result = irr_newton(cash_flows_array, NEWTON_GUESS, NEWTON_TOL, NEWTON_MAXITER)
+            if not converged:
+                irr_result = npf.irr(cash_flows_array)
 
             # 檢查結果是否有效
             if np.isnan(irr_result) or np.isinf(irr_result):
@@ -326,6 +308,7 @@ class IRRCalculatorService:
 
             # 2. 確定計算年數
             years = list(range(request.start_year, request.end_year + 1))
+            years_arr = np.arange(request.start_year, request.end_year + 1, dtype=np.int64)
             year_count = len(years)
 
             # 檢查年數是否有效
@@ -335,61 +318,55 @@ class IRRCalculatorService:
             # 3. 處理所有輸入數據（傳入設備容量以支援KW計算）
             equipment_capacity = request.equipment_params.capacity
 
-            income_values = IRRCalculatorService.process_data_input(request.income, year_count, years, equipment_capacity)
-            interest_values = IRRCalculatorService.calculate_interest_values(request.interest, equipment_cost, year_count, years)
-            rent_values = IRRCalculatorService.process_data_input(request.rent, year_count, years, equipment_capacity)
-            maintenance_values = IRRCalculatorService.process_data_input(request.maintenance, year_count, years, equipment_capacity)
-            insurance_values = IRRCalculatorService.process_data_input(request.insurance, year_count, years, equipment_capacity)
-            recycling_values = IRRCalculatorService.process_data_input(request.recycling, year_count, years, equipment_capacity)
+            # 六項輸入共用一塊 (6, 年數) 緩衝區，每列為連續記憶體，可直接傳入數值核心
+            inputs = np.empty((6, year_count), dtype=np.float64)
+            income_values, interest_values, rent_values, maintenance_values, insurance_values, recycling_values = inputs
 
-            # 4. 計算現金流
-            cash_flows = [-equipment_cost]  # 初始投資為負值（重資打包賣價）
-            cash_flow_items = []
+            IRRCalculatorService.process_data_input(request.income, year_count, years_arr, equipment_capacity, out=income_values)
+            IRRCalculatorService.calculate_interest_values(request.interest, equipment_cost, year_count, years, out=interest_values)
+            IRRCalculatorService.process_data_input(request.rent, year_count, years_arr, equipment_capacity, out=rent_values)
+            IRRCalculatorService.process_data_input(request.maintenance, year_count, years_arr, equipment_capacity, out=maintenance_values)
+            IRRCalculatorService.process_data_input(request.insurance, year_count, years_arr, equipment_capacity, out=insurance_values)
+            IRRCalculatorService.process_data_input(request.recycling, year_count, years_arr, equipment_capacity, out=recycling_values)
 
+            # 4. 計算現金流
             # 計算設備折舊（重資打包賣價平攤到每一年）
             equipment_depreciation_per_year = equipment_cost / year_count
 
-            for i in range(year_count):
-                # === 表格顯示用的計算 ===
-                # 稅前淨利 = 電費收入 - 設備折舊 - 利息 - 租金 - 運維 - 保險 - 回收費
-                pretax_net_profit = (income_values[i] - equipment_depreciation_per_year - interest_values[i] -
-                                   rent_values[i] - maintenance_values[i] - insurance_values[i] - recycling_values[i])
-
-                # 表格顯示用所得稅 = 稅前淨利 × 稅率
-                display_tax_amount = max(0, pretax_net_profit * request.tax_rate / 100) if pretax_net_profit > 0 else 0
-
-                # 稅後淨利 = 稅前淨利 - 所得稅
-                aftertax_net_profit = pretax_net_profit - display_tax_amount
-
-                # === IRR計算用的邏輯（完全不同）===
-                # IRR所得稅基礎 = 電費收入 - 設備折舊 - 租金 - 運維 - 保險 - 回收費
-                irr_tax_base = (income_values[i] - equipment_depreciation_per_year - rent_values[i] -
-                              maintenance_values[i] - insurance_values[i] - recycling_values[i])
-
-                # IRR所得稅 = IRR所得稅基礎 × 0.2
-                irr_tax_amount = max(0, irr_tax_base * 0.2) if irr_tax_base > 0 else 0
-
-                # IRR現金流 = 電費收入 - 租金 - 運維 - 保險 - 回收費 - IRR所得稅
-                irr_cash_flow = (income_values[i] - rent_values[i] - maintenance_values[i] -
-                               insurance_values[i] - recycling_values[i] - irr_tax_amount)
-
-                cash_flows.append(irr_cash_flow)
-
-                # 記錄現金流項目（用於表格顯示）
-                cash_flow_item = CashFlowItem(
-                    year=years[i],
-                    income=income_values[i],
-                    equipment_depreciation=equipment_depreciation_per_year,
-                    interest=interest_values[i],
-                    rent=rent_values[i],
-                    maintenance=maintenance_values[i],
-                    insurance=insurance_values[i],
-                    recycling=recycling_values[i],
-                    net_cash_flow=pretax_net_profit,  # 稅前淨利
-                    tax_amount=display_tax_amount,     # 表格顯示用所得稅
-                    after_tax_cash_flow=aftertax_net_profit  # 稅後淨利
+            depreciation_arr = np.full(year_count, equipment_depreciation_per_year, dtype=np.float64)
+
+            pretax_arr, display_tax_arr, aftertax_arr, irr_cf_arr = compute_cash_flows(
+                income_values, depreciation_arr, interest_values, rent_values,
+                maintenance_values, insurance_values, recycling_values, float(request.tax_rate)
+            )
+
+            cash_flows = [-equipment_cost]  # 初始投資為負值（重資打包賣價）
+            cash_flows.extend(irr_cf_arr.tolist())
+
+            # 記錄現金流項目（用於表格顯示）
+            # 先轉為 Python float，避免逐元素包裝 NumPy 純量
+            rows = zip(
+                years, income_values.tolist(), depreciation_arr.tolist(), interest_values.tolist(),
+                rent_values.tolist(), maintenance_values.tolist(), insurance_values.tolist(),
+                recycling_values.tolist(), pretax_arr.tolist(), display_tax_arr.tolist(), aftertax_arr.tolist()
+            )
+            cash_flow_items = [
+                CashFlowItem.model_construct(
+                    year=year,
+                    income=income,
+                    equipment_depreciation=depreciation,
+                    interest=interest,
+                    rent=rent,
+                    maintenance=maintenance,
+                    insurance=insurance,
+                    recycling=recycling,
+                    net_cash_flow=pretax,        # 稅前淨利
+                    tax_amount=display_tax,      # 表格顯示用所得稅
+                    after_tax_cash_flow=aftertax  # 稅後淨利
                 )
-                cash_flow_items.append(cash_flow_item)
+                for (year, income, depreciation, interest, rent, maintenance, insurance,
+                     recycling, pretax, display_tax, aftertax) in rows
+            ]
 
             # 5. 計算 IRR
             success, irr_value, error = IRRCalculatorService.calculate_irr_numpy(cash_flows)
@@ -420,7 +397,7 @@ class IRRCalculatorService:
                 error=f"計算過程發生錯誤: {str(e)}",
                 equipment_cost=0,
                 cash_flows=[],
-                cash_flow_statement=[],
+                cash_flow_statement=CashFlowStatementTable(),
                 irr_analysis=IRRAnalysis(),
                 years=[]
             )
\ No newline at end of file
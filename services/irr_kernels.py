@@ -0,0 +1,100 @@
+"""
+IRR 計算核心運算
+以 Numba JIT 編譯逐年現金流的純數值運算，Pydantic 物件於運算完成後再建立
+"""
+import numpy as np
+from numba import njit
+
+
+# 指定型別簽章，於匯入時即完成編譯，避免第一個請求承擔編譯時間
+COMPUTE_CASH_FLOWS_SIGNATURE = (
+    "UniTuple(float64[:], 4)(float64[:], float64[:], float64[:], float64[:], "
+    "float64[:], float64[:], float64[:], float64)"
+)
+IRR_NEWTON_SIGNATURE = "Tuple((boolean, float64))(float64[:], float64, float64, int64)"
+
+# Newton 法預設參數（指定簽章後 Numba 不支援省略參數）
+NEWTON_GUESS = 0.1
+NEWTON_TOL = 1e-7
+NEWTON_MAXITER = 50
+
+
+@njit(COMPUTE_CASH_FLOWS_SIGNATURE, cache=True, fastmath=True)
+def compute_cash_flows(income, dep, interest, rent, maint, ins, rec, tax_rate):
+    """
+    計算逐年稅前淨利、表格顯示用所得稅、稅後淨利及 IRR 現金流
+    所有輸入陣列皆為等長 float64，tax_rate 為百分比
+    """
+    n = income.shape[0]
+    pretax = np.empty(n)
+    display_tax = np.empty(n)
+    aftertax = np.empty(n)
+    irr_cf = np.empty(n)
+
+    for i in range(n):
+        # === 表格顯示用的計算 ===
+        # 稅前淨利 = 電費收入 - 設備折舊 - 利息 - 租金 - 運維 - 保險 - 回收費
+        expenses = rent[i] + maint[i] + ins[i] + rec[i]
+        pretax[i] = income[i] - dep[i] - interest[i] - expenses
+
+        # 表格顯示用所得稅 = 稅前淨利 × 稅率
+        display_tax[i] = pretax[i] * tax_rate / 100 if pretax[i] > 0 else 0.0
+
+        # 稅後淨利 = 稅前淨利 - 所得稅
+        aftertax[i] = pretax[i] - display_tax[i]
+
+        # === IRR計算用的邏輯（完全不同）===
+        # IRR所得稅基礎 = 電費收入 - 設備折舊 - 租金 - 運維 - 保險 - 回收費
+        irr_tax_base = income[i] - dep[i] - expenses
+
+        # IRR所得稅 = IRR所得稅基礎 × 0.2
+        irr_tax_amount = irr_tax_base * 0.2 if irr_tax_base > 0 else 0.0
+
+        # IRR現金流 = 電費收入 - 租金 - 運維 - 保險 - 回收費 - IRR所得稅
+        irr_cf[i] = income[i] - expenses - irr_tax_amount
+
+    return pretax, display_tax, aftertax, irr_cf
+
+
+@njit(IRR_NEWTON_SIGNATURE, cache=True)
+def irr_newton(cfs, guess, tol, maxiter):
+    """
+    以 Newton-Raphson 法求解 IRR（小數形式）
+    NPV 與其導數於同一迴圈內計算，回傳 (是否收斂, IRR)
+    """
+    n = cfs.shape[0]
+    r = guess
+
+    for _ in range(maxiter):
+        if r <= -1.0:
+            return False, np.nan
+
+        discount = 1.0 / (1.0 + r)
+        factor = 1.0
+        npv = 0.0
+        dnpv = 0.0
+        for t in range(n):
+            # factor = (1 + r) ^ -t
+            npv += cfs[t] * factor
+            dnpv -= t * cfs[t] * factor * discount
+            factor *= discount
+
+        if dnpv == 0.0:
+            return False, np.nan
+
+        step = npv / dnpv
+        r -= step
+        if abs(step) < tol:
+            return r > -1.0, r
+
+    return False, np.nan
+
+
+def warm_up() -> None:
+    """
+    以小型假資料執行一次所有核心，確保編譯結果已載入
+    於應用啟動時呼叫（搭配 gunicorn --preload，worker fork 後共用）
+    """
+    dummy = np.ones(2, dtype=np.float64)
+    compute_cash_flows(dummy, dummy, dummy, dummy, dummy, dummy, dummy, 20.0)
+    irr_newton(np.array([-1.0, 1.1]), NEWTON_GUESS, NEWTON_TOL, NEWTON_MAXITER)
@@ -2,133 +2,242 @@
 API 測試腳本
 測試 IRR 計算器的各項功能
 """
-import requests
-import json
+import atexit
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
+import orjson
 
-def test_health_check():
-    """測試健康檢查"""
-    print("🔍 測試健康檢查...")
-    try:
-        response = requests.get('http://localhost:5000/api/irr/health')
-        print(f"狀態碼: {response.status_code}")
-        print(f"回應: {response.json()}")
-        return response.status_code == 200
-    except Exception as e:
-        print(f"❌ 健康檢查失敗: {e}")
-        return False
+# 加上 --verbose 時才輸出完整的格式化回應
+VERBOSE = '--verbose' in sys.argv
 
+# 輸出分隔線
+SEP = "=" * 50
 
-def test_equipment_cost():
-    """測試設備費用計算"""
-    print("\n🔍 測試設備費用計算...")
-    data = {
+# requests.RequestException 繼承自 OSError，無需導入 requests 即可捕捉；
+# ValueError 涵蓋 JSON 解析錯誤
+REQUEST_ERRORS = (OSError, ValueError)
+
+
+@lru_cache(maxsize=1)
+def get_session():
+    """
+    取得共用 Session：重複使用 TCP 連線（HTTP keep-alive）
+    首次呼叫時才導入 requests，僅匯入本模組時不產生額外開銷
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # 不讀取代理環境變數與 .netrc，也不重試，避免每次請求的額外開銷
+    session = requests.Session()
+    session.trust_env = False
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'Connection': 'keep-alive',
+        'Accept-Encoding': 'gzip'
+    })
+    session.mount('http://', HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        pool_block=False,
+        max_retries=Retry(total=0)
+    ))
+    atexit.register(session.close)
+    return session
+
+# 設備費用計算測試用的請求內容
+EQUIPMENT_PAYLOAD = {
+    "capacity": 100,
+    "price_per_kw": 45000,
+    "profit_rate": 15,
+    "development_fee": 50000
+}
+
+# IRR 計算測試用的請求內容
+IRR_PAYLOAD = {
+    "start_year": 2025,
+    "end_year": 2030,
+    "equipment_params": {
         "capacity": 100,
         "price_per_kw": 45000,
         "profit_rate": 15,
         "development_fee": 50000
+    },
+    "income": {
+        "mode": "yearly",
+        "yearly_data": {
+            "yearly_values": [2500000, 2490000, 2480000, 2470000, 2460000, 2450000]
+        }
+    },
+    "interest": {
+        "no_interest": False,
+        "bank_loan_data": {
+            "loan_ratio": 70,
+            "bank_rate": 2.5,
+            "repayment_period": 5
+        }
+    },
+    "rent": {
+        "mode": "range",
+        "range_data": {
+            "total_amount": 120000,
+            "start_year": 2025,
+            "end_year": 2030
+        }
+    },
+    "maintenance": {
+        "mode": "yearly",
+        "yearly_data": {
+            "yearly_values": [15000, 16000, 17000, 18000, 19000, 20000]
+        }
+    },
+    "insurance": {
+        "mode": "range",
+        "range_data": {
+            "total_amount": 30000,
+            "start_year": 2025,
+            "end_year": 2030
+        }
+    },
+    "recycling": {
+        "mode": "yearly",
+        "yearly_data": {
+            "yearly_values": [0, 0, 0, 0, 0, 30000]
+        }
+    },
+    "tax_rate": 20,
+    "cash_flow_params": {
+        "dividend_ratio": 80,
+        "capital_reduction_period": 5
     }
+}
+
+# 請求內容固定，匯入時序列化一次（以 bytes 送出，requests 會直接設定 Content-Length）
+_EQUIPMENT_PAYLOAD_BYTES = orjson.dumps(EQUIPMENT_PAYLOAD)
+_IRR_PAYLOAD_BYTES = orjson.dumps(IRR_PAYLOAD)
+_IRR_BATCH_BYTES = orjson.dumps({'scenarios': [IRR_PAYLOAD]})
+
+
+def _emit(lines):
+    """一次輸出整個測試的診斷訊息"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def test_health_check():
+    """測試健康檢查"""
+    buf = ["🔍 測試健康檢查..."]
+    try:
+        response = get_session().get('http://localhost:5000/api/irr/health')
+        result = orjson.loads(response.content)
+    except REQUEST_ERRORS as e:
+        buf.append(f"❌ 健康檢查失敗: {e}")
+        _emit(buf)
+        return False
+
+    buf.append(f"狀態碼: {response.status_code}")
+    buf.append(f"回應: {result}")
+    _emit(buf)
+    return response.status_code == 200
+
 
+def test_equipment_cost():
+    """測試設備費用計算"""
+    buf = ["\n🔍 測試設備費用計算..."]
     try:
-        response = requests.post(
+        response = get_session().post(
             'http://localhost:5000/api/irr/equipment-cost',
-            json=data,
-            headers={'Content-Type': 'application/json'}
+            data=_EQUIPMENT_PAYLOAD_BYTES
         )
-        print(f"狀態碼: {response.status_code}")
-        result = response.json()
-        print(f"回應: {json.dumps(result, indent=2, ensure_ascii=False)}")
-        return response.status_code == 200 and result.get('success')
-    except Exception as e:
-        print(f"❌ 設備費用計算測試失敗: {e}")
+        result = orjson.loads(response.content)
+    except REQUEST_ERRORS as e:
+        buf.append(f"❌ 設備費用計算測試失敗: {e}")
+        _emit(buf)
         return False
 
+    ok = response.status_code == 200 and result.get('success', False)
+
+    buf.append(f"狀態碼: {response.status_code}")
+    if VERBOSE:
+        buf.append(f"回應: {orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()}")
+    if not ok:
+        buf.append(f"❌ 設備費用計算失敗: {result.get('error')}")
+    _emit(buf)
+    return ok
 
-def test_irr_calculation():
-    """測試完整 IRR 計算"""
-    print("\n🔍 測試 IRR 計算...")
-    data = {
-        "start_year": 2025,
-        "end_year": 2030,
-        "equipment_params": {
-            "capacity": 100,
-            "price_per_kw": 45000,
-            "profit_rate": 15,
-            "development_fee": 50000
-        },
-        "income": {
-            "mode": "yearly",
-            "yearly_data": {
-                "yearly_values": [100000, 105000, 110000, 115000, 120000, 125000]
-            },
-            "average_data": None
-        },
-        "interest": {
-            "mode": "yearly",
-            "yearly_data": {
-                "yearly_values": [50000, 45000, 40000, 35000, 30000, 25000]
-            },
-            "average_data": None
-        },
-        "rent": {
-            "mode": "average",
-            "yearly_data": None,
-            "average_data": {
-                "total_amount": 120000,
-                "periods": 6
-            }
-        },
-        "maintenance": {
-            "mode": "yearly",
-            "yearly_data": {
-                "yearly_values": [15000, 16000, 17000, 18000, 19000, 20000]
-            },
-            "average_data": None
-        },
-        "insurance": {
-            "mode": "average",
-            "yearly_data": None,
-            "average_data": {
-                "total_amount": 30000,
-                "periods": 6
-            }
-        },
-        "recycling": {
-            "mode": "yearly",
-            "yearly_data": {
-                "yearly_values": [0, 0, 0, 0, 0, 30000]
-            },
-            "average_data": None
-        },
-        "tax_rate": 20
-    }
 
+def test_irr_calculation(scenarios=None):
+    """測試完整 IRR 計算（多個情境以單一批次請求送出）"""
+    buf = ["\n🔍 測試 IRR 計算..."]
+    if scenarios is None:
+        scenarios = [IRR_PAYLOAD]
+        batch_body, scenario_bodies = _IRR_BATCH_BYTES, [_IRR_PAYLOAD_BYTES]
+    else:
+        batch_body = orjson.dumps({'scenarios': scenarios})
+        scenario_bodies = [orjson.dumps(scenario) for scenario in scenarios]
+
+    # 僅網路請求與 JSON 解析需要例外處理
+    session = get_session()
     try:
-        response = requests.post(
-            'http://localhost:5000/api/irr/calculate',
-            json=data,
-            headers={'Content-Type': 'application/json'}
+        response = session.post(
+            'http://localhost:5000/api/irr/calculate-batch',
+            data=batch_body
         )
-        print(f"狀態碼: {response.status_code}")
-        result = response.json()
+        batch_supported = response.status_code != 404
+        if batch_supported:
+            body = orjson.loads(response.content)
+        else:
+            # 伺服器不支援批次端點時，改為逐一送出（共用 Session 連線）
+            responses = [
+                session.post('http://localhost:5000/api/irr/calculate', data=scenario_body)
+                for scenario_body in scenario_bodies
+            ]
+            results = [orjson.loads(r.content) for r in responses]
+    except REQUEST_ERRORS as e:
+        buf.append(f"❌ IRR 計算測試失敗: {e}")
+        _emit(buf)
+        return False
+
+    if batch_supported:
+        buf.append(f"狀態碼: {response.status_code}")
+        ok = response.status_code == 200
+        results = body.get('results', [])
+        if not ok:
+            buf.append(f"❌ IRR 計算失敗: {body.get('error')}")
+    else:
+        buf.append("⚠️ 批次端點不存在，改為逐一計算")
+        buf.append(f"狀態碼: {[r.status_code for r in responses]}")
+        ok = all(r.status_code == 200 for r in responses)
 
-        if result.get('success'):
-            print(f"✅ IRR 計算成功: {result['irr']:.2f}%")
-            print(f"設備費用: NT$ {result['equipment_cost']:,.0f}")
-            print(f"現金流項目數: {len(result['cash_flows'])}")
+    if ok and len(results) != len(scenarios):
+        buf.append(f"❌ 結果數量不符: 送出 {len(scenarios)} 個情境，取得 {len(results)} 個結果")
+        ok = False
+
+    for index, result in enumerate(results, start=1):
+        if result.get('success', False):
+            buf.append(f"✅ 情境 {index} IRR 計算成功: {result['irr']:.2f}%")
+            buf.append(f"設備費用: NT$ {result['equipment_cost']:,.0f}")
+            buf.append(f"現金流項目數: {len(result['cash_flows'])}")
         else:
-            print(f"❌ IRR 計算失敗: {result.get('error')}")
+            buf.append(f"❌ 情境 {index} IRR 計算失敗: {result.get('error')}")
+            ok = False
 
-        return response.status_code == 200 and result.get('success')
-    except Exception as e:
-        print(f"❌ IRR 計算測試失敗: {e}")
-        return False
+    _emit(buf)
+    return ok
 
 
 def main():
     """主測試函數"""
+    # 預熱：先建立連線並放入連線池，後續測試直接重用
+    try:
+        get_session().options('http://localhost:5000/api/irr/health')
+    except REQUEST_ERRORS:
+        pass  # 連線失敗由健康檢查回報
+
     print("🧪 開始 API 測試")
-    print("="*50)
+    print(SEP)
 
     tests = [
         ("健康檢查", test_health_check),
@@ -139,14 +248,25 @@ def main():
     passed = 0
     total = len(tests)
 
-    for test_name, test_func in tests:
-        if test_func():
+    def report(test_name, ok):
+        nonlocal passed
+        if ok:
             print(f"✅ {test_name} 通過")
             passed += 1
         else:
             print(f"❌ {test_name} 失敗")
 
-    print("\n" + "="*50)
+    # 健康檢查先行，其餘測試彼此獨立，並行送出
+    health_name, health_func = tests[0]
+    report(health_name, health_func())
+
+    with ThreadPoolExecutor(max_workers=len(tests) - 1) as executor:
+        futures = {executor.submit(test_func): test_name for test_name, test_func in tests[1:]}
+        for future in as_completed(futures):
+            report(futures[future], future.result())
+
+    print()
+    print(SEP)
     print(f"測試結果: {passed}/{total} 通過")
 
     if passed == total:
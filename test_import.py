@@ -1,50 +1,60 @@
 """
 測試所有依賴的導入
 """
-try:
-    print("🔍 測試基本 Python 模組...")
-    import sys
-    print(f"✅ Python 版本: {sys.version}")
+import importlib
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# 診斷訊息先收集，結束時一次輸出
+lines = []
 
-    print("\n🔍 測試 Flask 相關...")
-    import flask
-    print(f"✅ Flask 版本: {flask.__version__}")
+# 第三方依賴彼此獨立，並行導入
+THIRD_PARTY_MODULES = ['flask', 'flask_cors', 'numpy', 'pandas', 'numpy_financial', 'pydantic']
+
+try:
+    lines.append("🔍 測試基本 Python 模組...")
+    lines.append(f"✅ Python 版本: {sys.version}")
 
-    import flask_cors
-    print("✅ Flask-CORS 導入成功")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {name: executor.submit(importlib.import_module, name) for name in THIRD_PARTY_MODULES}
 
-    print("\n🔍 測試數據處理...")
-    import numpy as np
-    print(f"✅ NumPy 版本: {np.__version__}")
+    # 依原順序取回結果，導入失敗時於此拋出 ImportError
+    modules = {name: future.result() for name, future in futures.items()}
 
-    import pandas as pd
-    print(f"✅ Pandas 版本: {pd.__version__}")
+    lines.append("\n🔍 測試 Flask 相關...")
+    lines.append(f"✅ Flask 版本: {modules['flask'].__version__}")
+    lines.append("✅ Flask-CORS 導入成功")
 
-    import numpy_financial as npf
-    print("✅ NumPy-Financial 導入成功")
+    lines.append("\n🔍 測試數據處理...")
+    lines.append(f"✅ NumPy 版本: {modules['numpy'].__version__}")
+    lines.append(f"✅ Pandas 版本: {modules['pandas'].__version__}")
+    lines.append("✅ NumPy-Financial 導入成功")
 
-    print("\n🔍 測試 Pydantic...")
-    import pydantic
-    print(f"✅ Pydantic 版本: {pydantic.__version__}")
+    lines.append("\n🔍 測試 Pydantic...")
+    lines.append(f"✅ Pydantic 版本: {modules['pydantic'].__version__}")
 
     from pydantic import BaseModel, Field
-    print("✅ Pydantic 基本類別導入成功")
+    lines.append("✅ Pydantic 基本類別導入成功")
 
-    print("\n🔍 測試自定義模組...")
+    # 自定義模組依賴上述套件，依序導入
+    lines.append("\n🔍 測試自定義模組...")
     from models.irr_models_v2 import IRRCalculationRequest
-    print("✅ IRR 模型導入成功")
+    lines.append("✅ IRR 模型導入成功")
 
     from services.irr_calculator import IRRCalculatorService
-    print("✅ IRR 計算服務導入成功")
+    lines.append("✅ IRR 計算服務導入成功")
 
     from api.irr_routes import irr_bp
-    print("✅ API 路由導入成功")
+    lines.append("✅ API 路由導入成功")
 
-    print("\n🎉 所有依賴測試通過！可以啟動應用了。")
+    lines.append("\n🎉 所有依賴測試通過！可以啟動應用了。")
 
 except ImportError as e:
-    print(f"❌ 導入錯誤: {e}")
-    print("請執行: pip install -r requirements.txt")
+    lines.append(f"❌ 導入錯誤: {e}")
+    lines.append("請執行: pip install -r requirements.txt")
 except Exception as e:
-    print(f"❌ 其他錯誤: {e}")
-    print(f"錯誤類型: {type(e).__name__}")
\ No newline at end of file
+    lines.append(f"❌ 其他錯誤: {e}")
+    lines.append(f"錯誤類型: {type(e).__name__}")
+finally:
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()